@@ -1,8 +1,23 @@
-from .core import create_package
 from .cli import main
 
 
 __all__ = (
     "create_package",
+    "create_packages",
     "main",
 )
+
+
+def __getattr__(name):
+    # Import 'core' only when needed, it imports 'ayon_api' and 'poetry'
+    #   which is slow for cli calls that do not use them (e.g. '--help')
+    if name == "create_package":
+        from .core import create_package
+
+        return create_package
+
+    if name == "create_packages":
+        from .core import create_packages
+
+        return create_packages
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,54 +1,136 @@
 """Get runtime python modules from build using this script.
 
 Execute this script using venv python executable to get runtime python modules.
-The script is using 'pkg_resources' to get runtime modules and their versions.
-Output is stored to a json file that must be provided by last argument.
+The script is using 'importlib.metadata' to get runtime modules and their
+versions. Output is stored to a json file that must be provided by last
+argument.
 """
 
+import os
+import re
 import sys
 import json
+import functools
 from pathlib import Path
+from importlib.metadata import distributions
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def get_runtime_modules(runtime_root):
-    sys.path.insert(0, runtime_root)
-    # Import 'pkg_resources' after adding runtime root to 'sys.path'
-    import pkg_resources
 
-    runtime_root = Path(runtime_root)
+@functools.lru_cache(maxsize=None)
+def _cached_distributions(path_tuple):
+    """Distributions found in paths.
 
-    # One of the dependencies from runtime dependencies must be imported
-    #   so 'pkg_resources' have them available in 'working_set'
-    # This approach makes sure that we use right version that are really
-    #   installed in runtime dependencies directory. Keep in mind that some
-    #   dependencies have other modules as requirements that may not be
-    #   listed in pyproject.toml and there might not be explicit version.
-    #   Also using version from modules require to import them and be lucky
-    #   that version is available and that installed module have same name
-    #   as pip package (e.g. 'PIL' vs. 'Pillow').
-    # TODO find a better way how to define one dependency to import
-    # Randomly chosen module inside runtime dependencies
+    Result is cached so metadata directories are scanned only once.
 
+    Args:
+        path_tuple (tuple[str, ...]): Paths where to look for distributions.
+
+    Returns:
+        list[importlib.metadata.Distribution]: Found distributions.
+    """
+
+    return list(distributions(path=list(path_tuple)))
+
+
+def _safe_name(name):
+    # Match project name normalization of 'pkg_resources'
+    return re.sub(r"[^A-Za-z0-9.]+", "-", name)
+
+
+def _get_dist_name_version(dist):
+    """Name and version of distribution.
+
+    Name and version are parsed from '.dist-info' directory name
+    ('{name}-{version}.dist-info') which does not require to read METADATA
+    file. Metadata are used only if directory name cannot be parsed
+    (e.g. '.egg-info').
+
+    Args:
+        dist (importlib.metadata.Distribution): Distribution.
+
+    Returns:
+        tuple[Union[str, None], Union[str, None]]: Name and version.
+    """
+
+    info_path = getattr(dist, "_path", None)
+    if info_path is not None:
+        # Use string operations, 'suffix' and 'stem' of path object are
+        #   recalculated on each access
+        dirname = os.path.basename(info_path)
+        if dirname.endswith(".dist-info"):
+            stem = dirname[:-len(".dist-info")]
+            name, sep, version = stem.partition("-")
+            if sep and name and version:
+                return name, version
+
+    # Read metadata only once, each access parses the METADATA file
+    metadata = dist.metadata
+    return metadata["Name"], metadata["Version"]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_runtime_modules(runtime_roots):
+    # Look for distributions only in runtime roots, 'sys.path' does not
+    #   have to be modified and other paths in it are not scanned
     output = {}
-    for package in pkg_resources.working_set:
-        package_path = Path(package.module_path)
-        if package_path.is_relative_to(runtime_root):
-            output[package.project_name] = package.version
+    for dist in _cached_distributions(runtime_roots):
+        name, version = _get_dist_name_version(dist)
+        if not name:
+            continue
+        output[_safe_name(name)] = version
     return output
 
 
+def get_runtime_modules(runtime_roots):
+    """Runtime python modules with their versions.
+
+    Args:
+        runtime_roots (Union[str, list[str]]): Path or paths to runtime
+            site-packages (e.g. purelib and platlib).
+
+    Returns:
+        dict[str, str]: Version by python module name.
+    """
+
+    if isinstance(runtime_roots, str):
+        runtime_roots = [runtime_roots]
+
+    # Normalize and deduplicate roots so the same roots use cached result
+    runtime_roots = tuple(dict.fromkeys(
+        os.path.normcase(os.path.abspath(runtime_root))
+        for runtime_root in runtime_roots
+    ))
+    return dict(_get_runtime_modules(runtime_roots))
+
+
+def _read_json(path):
+    content = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _write_json(path, data):
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=4))
+
+
 def main():
-    output_path = sys.argv[-1]
-    with open(output_path, "r") as stream:
-        data = json.load(stream)
+    output_path = Path(sys.argv[-1])
+    data = _read_json(output_path)
 
     data["runtime_dependencies"] = get_runtime_modules(
         data["runtime_site_packages"]
     )
 
     print(f"Storing output to {output_path}")
-    with open(output_path, "w") as stream:
-        json.dump(data, stream, indent=4)
+    _write_json(output_path, data)
 
 
 if __name__ == "__main__":
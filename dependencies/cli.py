@@ -1,9 +1,55 @@
 import os
+import heapq
+import functools
+
 import click
-import ayon_api
-from ayon_api.constants import SERVER_URL_ENV_KEY, SERVER_API_ENV_KEY
 
-from .core import create_package, get_bundles
+# Same values as in 'ayon_api.constants', 'ayon_api' is imported only
+#   when a command needs it
+SERVER_URL_ENV_KEY = "AYON_SERVER_URL"
+SERVER_API_ENV_KEY = "AYON_API_KEY"
+
+
+@functools.lru_cache(maxsize=1)
+def _connect(server, api_key):
+    """Connect to AYON server.
+
+    Connection is cached so commands called in same process reuse it.
+        Connection uses http session so requests do not open new
+        connection to the server.
+
+    Args:
+        server (Union[str, None]): AYON server url.
+        api_key (Union[str, None]): Api key.
+
+    Returns:
+        ayon_api.ServerAPI: Connection to server.
+
+    Raises:
+        click.UsageError: Server url is not set.
+    """
+
+    # Validate values from click before environment is changed
+    if not server:
+        raise click.UsageError(
+            "AYON server url is not set. Use '--server' or set"
+            f" '{SERVER_URL_ENV_KEY}' environment variable."
+        )
+
+    import ayon_api
+
+    os.environ[SERVER_URL_ENV_KEY] = server
+
+    if api_key:
+        os.environ[SERVER_API_ENV_KEY] = api_key
+
+    if ayon_api.create_connection() is False:
+        raise RuntimeError("Could not connect to server.")
+    con = ayon_api.get_server_api_connection()
+    # Use one http session for all requests so connection is kept alive
+    #   between requests
+    con.create_session()
+    return con
 
 
 @click.group()
@@ -32,20 +78,21 @@ def main_cli():
     "--api-key",
     help="Api key",
     envvar=SERVER_API_ENV_KEY)
-def create(bundle_name, skip_upload, output_dir, server, api_key):
-    if server:
-        os.environ[SERVER_URL_ENV_KEY] = server
-
-    if api_key:
-        os.environ[SERVER_API_ENV_KEY] = api_key
-
-    if ayon_api.create_connection() is False:
-        raise RuntimeError("Could not connect to server.")
+@click.option(
+    "-v",
+    "--verbose",
+    is_flag=True,
+    help="Print output of dependency solver")
+def create(bundle_name, skip_upload, output_dir, server, api_key, verbose):
+    from .core import create_package
 
+    con = _connect(server, api_key)
     create_package(
         bundle_name,
+        con=con,
         skip_upload=skip_upload,
-        output_dir=output_dir
+        output_dir=output_dir,
+        verbose=verbose,
     )
 
 
@@ -58,21 +105,25 @@ def create(bundle_name, skip_upload, output_dir, server, api_key):
     "--api-key",
     help="Api key",
     envvar=SERVER_API_ENV_KEY)
-def list_bundles(server, api_key):
-    if server:
-        os.environ[SERVER_URL_ENV_KEY] = server
-
-    if api_key:
-        os.environ[SERVER_API_ENV_KEY] = api_key
+@click.option(
+    "--limit",
+    type=click.IntRange(min=0),
+    help="List only first N bundles")
+def list_bundles(server, api_key, limit):
+    from .core import get_bundles
 
-    if ayon_api.create_connection() is False:
-        raise RuntimeError("Could not connect to server.")
+    con = _connect(server, api_key)
+    bundle_names = get_bundles(con)
+    if limit is None:
+        bundle_names = sorted(bundle_names)
+    else:
+        bundle_names = heapq.nsmallest(limit, bundle_names)
 
-    con = ayon_api.get_server_api_connection()
-    print("--- Available bundles ---")
-    for bundle_name in sorted(get_bundles(con)):
-        print(bundle_name)
-    print("-------------------------")
+    # Print all lines at once
+    lines = ["--- Available bundles ---"]
+    lines.extend(bundle_names)
+    lines.append("-------------------------")
+    print("\n".join(lines))
 
 
 def main():
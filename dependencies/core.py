@@ -1,21 +1,39 @@
 import os
-import re
 import tempfile
-import copy
-import platform
 import hashlib
 import zipfile
 import json
 import subprocess
 import collections
 import shutil
-
-from typing import Dict, Union, Any, List
+import functools
+import zlib
+import glob
+import threading
+
+from typing import Dict, Union, Any, List, Optional, Tuple, FrozenSet
+from importlib.metadata import distributions
+from concurrent.futures import ThreadPoolExecutor
 from packaging import version
+from packaging.utils import canonicalize_name
 from dataclasses import dataclass
 
 import toml
 import requests
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11, 'tomli' is installed as dependency of poetry
+    import tomli as tomllib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    # Faster deflate compatible with 'zlib' (optional)
+    from isal import isal_zlib as deflate_zlib
+except ImportError:
+    deflate_zlib = zlib
 from poetry.core.constraints.version import (
     parse_constraint,
     EmptyConstraint,
@@ -32,11 +50,13 @@ from ayon_api import create_dependency_package_basename
 from .utils import (
     run_subprocess,
     ZipFileLongPaths,
+    HashingWriter,
     get_venv_executable,
     get_venv_site_packages,
     PACKAGE_ROOT,
+    PLATFORM_NAME,
+    IS_WINDOWS,
 )
-from .custom_solver import solve_dependencies
 
 ConstraintClasses = (
     EmptyConstraint,
@@ -49,6 +69,71 @@ ConstraintClassesHint = Union[
     VersionRangeConstraint
 ]
 POETRY_VERSION = "1.8.1"
+# Files with these extensions are already compressed, compressing them
+#   again only costs time
+_STORED_EXTENSIONS = {
+    ".zip", ".whl", ".egg", ".jar",
+    ".gz", ".tgz", ".bz2", ".xz", ".7z",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp",
+    ".woff", ".woff2",
+}
+_ZIP_COMPRESS_LEVEL = 1
+# Bigger files are not compressed in parallel to limit memory usage
+_ZIP_MAX_PARALLEL_FILE_SIZE = 16 * 1024 * 1024
+# Temp directory files removal
+_REMOVE_MAX_WORKERS = 16
+_REMOVE_ATTEMPTS = 5
+# Threads removing processing directories of finished packages
+_CLEANUP_THREADS = []
+_CLEANUP_THREADS_LOCK = threading.Lock()
+# Packages which are not listed by 'pip freeze'
+_FREEZE_SKIP_PACKAGES = frozenset({"pip"})
+# Packages which are not listed by 'pip freeze' on Python < 3.12
+_FREEZE_SKIP_PACKAGES_LEGACY = frozenset(
+    {"pip", "setuptools", "wheel", "distribute"}
+)
+# Size of chunks read from file when hash is calculated
+_HASH_BLOCK_SIZE = 1024 * 1024
+# Maximum number of parsed addon tomls kept in memory
+_ADDON_TOML_CACHE_SIZE = 4096
+# Maximum number of parsed version constraints kept in memory
+_CONSTRAINT_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_CONSTRAINT_CACHE_SIZE)
+def _parse_constraint(constraint: str) -> ConstraintClassesHint:
+    """Cached 'parse_constraint'.
+
+    Same constraints (e.g. '*' or '^3.9') are parsed many times when
+        dependencies of multiple addons are merged. Constraint objects are
+        not modified so they can be shared.
+
+    Args:
+        constraint (str): Version constraint.
+
+    Returns:
+        ConstraintClassesHint: Parsed constraint.
+    """
+
+    return parse_constraint(constraint)
+
+
+@functools.lru_cache(maxsize=_ADDON_TOML_CACHE_SIZE)
+def _parse_addon_toml(content: str) -> Dict[str, Any]:
+    """Cached parsing of addon toml content.
+
+    Same addon tomls are parsed for each bundle using the addon version.
+        Parsed data are shared between bundles, they are only read during
+        merge and must not be modified.
+
+    Args:
+        content (str): Toml content.
+
+    Returns:
+        dict[str, Any]: Parsed toml data.
+    """
+
+    return tomllib.loads(content)
 
 
 @dataclass
@@ -62,8 +147,10 @@ class Bundle:
 def get_poetry_install_script() -> str:
     """Get Poetry install script path.
 
-    Script is cached in downloads folder. If script is not cached ye, it
-        will be downloaded.
+    Script is cached in downloads folder. Cached script is validated with
+        conditional request using 'ETag' and 'Last-Modified' headers of
+        previous download, script is downloaded only if it was changed.
+        Cached script is used if server is not reachable.
 
     Returns:
         str: Path to poetry install script.
@@ -73,12 +160,58 @@ def get_poetry_install_script() -> str:
     if not os.path.exists(downloads_dir):
         os.makedirs(downloads_dir)
     poetry_script_path = os.path.join(
-        downloads_dir, f"poetry-install-script.py")
-    if os.path.exists(poetry_script_path):
-        return poetry_script_path
-    response = requests.get("https://install.python-poetry.org")
-    with open(poetry_script_path, "wb") as stream:
-        stream.write(response.content)
+        downloads_dir, "poetry-install-script.py")
+    cache_info_path = os.path.join(
+        downloads_dir, "poetry-install-script.json")
+
+    cache_info = {}
+    is_cached = os.path.exists(poetry_script_path)
+    if is_cached and os.path.exists(cache_info_path):
+        try:
+            with open(cache_info_path, "r") as stream:
+                cache_info = json.load(stream)
+        except ValueError:
+            pass
+
+    headers = {}
+    if cache_info.get("etag"):
+        headers["If-None-Match"] = cache_info["etag"]
+    if cache_info.get("last_modified"):
+        headers["If-Modified-Since"] = cache_info["last_modified"]
+
+    try:
+        response = requests.get(
+            "https://install.python-poetry.org",
+            headers=headers,
+            stream=True,
+            timeout=30,
+        )
+    except requests.RequestException:
+        if is_cached:
+            return poetry_script_path
+        raise
+
+    # Download to temp file first, partially downloaded script must not be
+    #   used as cached script
+    tmp_path = f"{poetry_script_path}.tmp"
+    with response:
+        if is_cached and response.status_code == 304:
+            return poetry_script_path
+        response.raise_for_status()
+        # Raw stream is not decoded by default (e.g. gzip)
+        response.raw.decode_content = True
+        with open(tmp_path, "wb") as stream:
+            shutil.copyfileobj(response.raw, stream, length=64 * 1024)
+    os.replace(tmp_path, poetry_script_path)
+
+    with open(cache_info_path, "w") as stream:
+        json.dump(
+            {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            },
+            stream
+        )
     return poetry_script_path
 
 
@@ -103,7 +236,7 @@ def get_pyenv_arguments(
         return
     print(f"Installing Python {python_version} with pyenv")
     install_args = [pyenv_path, "install", python_version, "--skip-existing"]
-    if platform.system().lower() == "windows":
+    if IS_WINDOWS:
         install_args.append("--quiet")
     result = subprocess.run(install_args)
     if result.returncode != 0:
@@ -210,12 +343,12 @@ def get_bundle_addons_tomls(
     print("Getting dependencies for addons:")
     for addon in bundle_addons:
         print(f"  - {addon}")
+    # Look up only bundle addons, all addons can contain many versions
     addon_tomls = get_all_addon_tomls(con)
-
     return {
-        addon_full_name: toml
-        for addon_full_name, toml in addon_tomls.items()
-        if addon_full_name in bundle_addons
+        addon_full_name: addon_tomls[addon_full_name]
+        for addon_full_name in bundle_addons
+        if addon_full_name in addon_tomls
     }
 
 
@@ -234,6 +367,25 @@ def find_installer_by_name(
     raise ValueError(f"{bundle_name} must have installer present.")
 
 
+def _copy_dependencies(dependencies: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy dependencies mapping.
+
+    Values are strings or flat dictionaries (e.g. platform specific
+        definitions), so only one level is copied instead of 'deepcopy'.
+
+    Args:
+        dependencies (dict[str, Any]): Dependencies with versions.
+
+    Returns:
+        dict[str, Any]: Copied dependencies.
+    """
+
+    return {
+        key: value.copy() if isinstance(value, dict) else value
+        for key, value in dependencies.items()
+    }
+
+
 def get_installer_toml(installer: Dict[str, Any]) -> Dict[str, Any]:
     """Returns dict with format matching of .toml file for `installer_name`.
 
@@ -251,7 +403,7 @@ def get_installer_toml(installer: Dict[str, Any]) -> Dict[str, Any]:
         dict[str, Any]: Installer toml content.
     """
 
-    python_modules = copy.deepcopy(installer["pythonModules"])
+    python_modules = _copy_dependencies(installer["pythonModules"])
     python_modules["python"] = installer["pythonVersion"]
     return {
         "tool": {
@@ -268,7 +420,7 @@ def get_installer_toml(installer: Dict[str, Any]) -> Dict[str, Any]:
             }
         },
         "ayon": {
-            "runtimeDependencies": copy.deepcopy(
+            "runtimeDependencies": _copy_dependencies(
                 installer["runtimePythonModules"]
             )
         }
@@ -288,17 +440,8 @@ def is_valid_toml(toml: Dict[str, Any]) -> bool:
         KeyError
     """
 
-    required_fields = ["tool.poetry"]
-    for field in required_fields:
-        fields = field.split(".")
-        value = toml
-        while fields:
-            key = fields.pop(0)
-            value = value.get(key)
-
-            if not value:
-                raise KeyError(f"Toml content must contain {field}")
-
+    if not toml.get("tool", {}).get("poetry"):
+        raise KeyError("Toml content must contain tool.poetry")
     return True
 
 
@@ -321,7 +464,7 @@ def _merge_dependency(
         raise ValueError(
             "RuntimeDependency must be defined as version.")
 
-    dep_info_c = parse_constraint(dep_info)
+    dep_info_c = _parse_constraint(dep_info)
     if (
         resolved_vers.is_empty()
         or not dep_info_c.allows_all(resolved_vers)
@@ -330,13 +473,16 @@ def _merge_dependency(
             f"Cannot result {dependency} with"
             f" {dep_info} for {addon_name}"
         )
-    return str(dep_info_c.union(resolved_vers))
+    # Keep constraint object so it is not parsed again for next addon,
+    #   it is converted to string at the end of 'get_full_toml'
+    return dep_info_c.union(resolved_vers)
 
 
 def merge_tomls_dependencies(
     main_toml: Dict[str, Dict[str, Any]],
     addon_toml: Dict[str, Dict[str, Any]],
     addon_name: str,
+    requested_by: Optional[Dict[str, List[Tuple[str, Any]]]] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """Add dependencies from 'addon_toml' to 'main_toml'.
 
@@ -346,6 +492,16 @@ def merge_tomls_dependencies(
         - ["tool"]["poetry"]["dependencies"]
         - ["ayon"]["runtimeDependencies"]
 
+    Args:
+        main_toml (dict[str, dict[str, Any]]): Toml data where
+            dependencies are merged.
+        addon_toml (dict[str, dict[str, Any]]): Addon toml data.
+        addon_name (str): Addon name.
+        requested_by (Optional[dict[str, list[tuple[str, Any]]]]): Requests
+            of dependency versions by dependency name, as pairs of requester
+            and version. Is filled during merge of multiple addons to report
+            all requests causing conflict.
+
     Returns:
         (dict): updated 'main_toml' with additional/updated dependencies
 
@@ -353,6 +509,9 @@ def merge_tomls_dependencies(
         ValueError if any tuple of main and addon dependency cannot be resolved
     """
 
+    if requested_by is None:
+        requested_by = {}
+
     main_dependencies = (
         main_toml["tool"]["poetry"].setdefault("dependencies", {})
     )
@@ -365,17 +524,33 @@ def merge_tomls_dependencies(
 
     for dependency, dep_version in addon_dependencies.items():
         main_version = main_dependencies.get(dependency)
+        # Messages are formatted only when conflict is reported
+        requesters = requested_by.get(dependency)
+        if requesters is None:
+            requesters = []
+            if main_version:
+                requesters.append(("installer", main_version))
+            requested_by[dependency] = requesters
+        requesters.append((addon_name, dep_version))
+
         resolved_vers = _get_correct_version(main_version, dep_version)
-        if not main_version:
-            main_version = "N/A"
+        # Addon toml data are cached and shared, dictionary definitions
+        #   (e.g. git source) must not be changed in merged toml
+        if resolved_vers is dep_version and isinstance(dep_version, dict):
+            resolved_vers = dep_version.copy()
 
         if (
             isinstance(resolved_vers, ConstraintClasses)
             and resolved_vers.is_empty()
         ):
+            requesters_msg = ", ".join(
+                f"{requester} ({requested_version})"
+                for requester, requested_version in requesters
+            )
             raise ValueError(
                 f"Version {dep_version} cannot be resolved against"
-                f" {main_version} for {dependency} in {addon_name}"
+                f" {main_version or 'N/A'} for {dependency} in {addon_name}."
+                f" Requested by: {requesters_msg}"
             )
 
         main_dependencies[dependency] = resolved_vers
@@ -422,18 +597,14 @@ def merge_tomls_runtime(
             if "version" in dep_info:
                 dep_info = dep_info["version"]
 
-        if dependency in main_dependencies:
-            main_dependencies[dependency] = _merge_dependency(
-                main_dependencies[dependency],
-                dep_info,
-                platform_name,
-                dependency,
-                addon_name
-            )
-            continue
-
-        main_runtime[dependency] = _merge_dependency(
-            main_runtime.get(dependency),
+        # Merge to dependencies if already there, otherwise to runtime
+        target_dependencies = (
+            main_dependencies
+            if dependency in main_dependencies
+            else main_runtime
+        )
+        target_dependencies[dependency] = _merge_dependency(
+            target_dependencies.get(dependency),
             dep_info,
             platform_name,
             dependency,
@@ -472,17 +643,17 @@ def _get_correct_version(
 
     if not main_version:
         if isinstance(dep_version, str):
-            dep_version = parse_constraint(dep_version)
+            dep_version = _parse_constraint(dep_version)
         return dep_version
 
     if isinstance(main_version, str):
-        main_version = parse_constraint(main_version)
+        main_version = _parse_constraint(main_version)
 
     if not dep_version:
         return main_version
 
     if isinstance(dep_version, str):
-        dep_version = parse_constraint(dep_version)
+        dep_version = _parse_constraint(dep_version)
 
     if hasattr(dep_version, "intersect"):
         return dep_version.intersect(main_version)
@@ -490,8 +661,10 @@ def _get_correct_version(
 
 
 def _is_url_constraint(version: Any) -> bool:
-    version = str(version)
-    return "http" in version or "git" in version
+    if not isinstance(version, str):
+        version = str(version)
+    # Only prefixes which are handled by '_convert_url_constraints'
+    return version.startswith(("http", "git+"))
 
 
 def _version_parse(version_value):
@@ -527,7 +700,9 @@ def get_full_toml(base_toml_data, addon_tomls, platform_name):
     main_dependencies = base_toml_data["tool"]["poetry"]["dependencies"]
     modified_dependencies = {}
     for key, value in main_dependencies.items():
-        if not isinstance(value, str):
+        # Version constraints don't contain ':', skip them before url
+        #   parsing
+        if not isinstance(value, str) or ":" not in value:
             continue
 
         if not is_url(value) and not value.startswith("git+http"):
@@ -549,18 +724,22 @@ def get_full_toml(base_toml_data, addon_tomls, platform_name):
 
         modified_dependencies[key] = new_value
     main_dependencies.update(modified_dependencies)
-    for addon_name, addon_toml_data in tuple(addon_tomls.items()):
-        if isinstance(addon_toml_data, str):
-            addon_tomls[addon_name] = toml.loads(addon_toml_data)
 
-    # Merge addon dependencies
+    # Parse and merge addon dependencies
+    requested_by = {}
     for addon_name, addon_toml_data in addon_tomls.items():
+        if isinstance(addon_toml_data, str):
+            addon_toml_data = _parse_addon_toml(addon_toml_data)
+            addon_tomls[addon_name] = addon_toml_data
+
         print(f"Merging in {addon_name} dependencies")
-        
         base_toml_data = merge_tomls_dependencies(
-            base_toml_data, addon_toml_data, addon_name
+            base_toml_data, addon_toml_data, addon_name, requested_by
         )
 
+    # Runtime dependencies must be merged after all dependencies are merged,
+    #   runtime dependency is merged to dependencies if any addon has it
+    #   in dependencies
     for addon_name, addon_toml_data in addon_tomls.items():
         print(f"Merging in {addon_name} runtime dependencies")
 
@@ -570,11 +749,15 @@ def get_full_toml(base_toml_data, addon_tomls, platform_name):
 
     # Convert all 'ConstraintClassesHint' to 'str'
     main_dependencies = base_toml_data["tool"]["poetry"]["dependencies"]
-    modified_dependencies = {}
-    for key, value in main_dependencies.items():
-        if not isinstance(value, (str, dict)):
-            modified_dependencies[key] = str(value)
-    main_dependencies.update(modified_dependencies)
+    runtime_dependencies = (
+        base_toml_data.get("ayon", {}).get("runtimeDependencies")
+    ) or {}
+    for dependencies in (main_dependencies, runtime_dependencies):
+        modified_dependencies = {}
+        for key, value in dependencies.items():
+            if not isinstance(value, (str, dict)):
+                modified_dependencies[key] = str(value)
+        dependencies.update(modified_dependencies)
 
     print("Collected dependencies:")
     for key, value in sorted(main_dependencies.items()):
@@ -617,7 +800,7 @@ def prepare_new_venv(output_root, installer):
     poetry_bin = os.path.join(poetry_home, "bin", "poetry")
     venv_path = os.path.join(output_root, ".venv")
 
-    env = dict(os.environ.items())
+    env = os.environ.copy()
     env["POETRY_VERSION"] = POETRY_VERSION
     env["POETRY_HOME"] = poetry_home
     # Create poetry in output root
@@ -631,14 +814,13 @@ def prepare_new_venv(output_root, installer):
     )
     env["VIRTUAL_ENV"] = venv_path
     # Change poetry config to ignore venv in poetry
-    for config_key, config_value in (
-        ("virtualenvs.create", "false"),
-        ("virtualenvs.in-project", "false"),
-    ):
-        run_subprocess(
-            [poetry_bin, "config", config_key, config_value, "--local"],
-            env=env,
-            cwd=output_root
+    # - write local config file directly, same as
+    #   'poetry config <key> <value> --local' does, without starting
+    #   poetry process for each key
+    with open(os.path.join(output_root, "poetry.toml"), "w") as stream:
+        toml.dump(
+            {"virtualenvs": {"create": False, "in-project": False}},
+            stream
         )
 
     return VenvInfo(
@@ -657,10 +839,10 @@ def install_poetry(
 
     _convert_url_constraints(full_toml_data)
 
-    installer_runtime_dependencies = copy.deepcopy(
+    installer_runtime_dependencies = _copy_dependencies(
         installer["runtimePythonModules"]
     )
-    runtime_dependencies = copy.deepcopy(
+    runtime_dependencies = _copy_dependencies(
         full_toml_data["ayon"]["runtimeDependencies"]
     )
     # Remove installer dependencies to find out if there are any other
@@ -699,74 +881,107 @@ def install_poetry(
     _install_runtime_dependencies(
         runtime_dependencies,
         runtime_root,
-        venv_info.poetry_bin,
+        venv_info.venv_path,
         venv_info.poetry_env
     )
-    if platform.system().lower() == "windows":
-        runtime_site_packages = os.path.join(
-            runtime_root, "Lib", "site-packages"
-        )
-    else:
-        lib_dir = os.path.join(runtime_root, "lib")
-        # linux and macos create python{x}.{y} subfolder (should create
-        #   only one)
-        runtime_site_packages = os.path.join(
-            lib_dir, f"python{venv_info.python_version[:3]}", "site-packages"
-        )
-        # Fill correct path only if exists
-        if os.path.exists(lib_dir):
-            python_subdirs = list(os.listdir(lib_dir))
-            if python_subdirs:
-                python_subdir = python_subdirs[0]
-                runtime_site_packages = os.path.join(
-                    lib_dir, python_subdir, "site-packages"
-                )
+    runtime_site_packages = _get_runtime_site_packages(
+        runtime_root, venv_info.python_version
+    )
 
     return runtime_site_packages, installed_installer_runtime_deps
 
 
+def _constraint_to_requirement_specifier(
+    constraint: ConstraintClassesHint
+) -> str:
+    """Convert poetry constraint to pip requirement specifier.
+
+    Args:
+        constraint (ConstraintClassesHint): Parsed version constraint.
+
+    Returns:
+        str: Specifier e.g. '==1.0.0' or '>=1.0,<2.0'. Empty string
+            if any version is allowed.
+    """
+
+    if constraint.is_any():
+        return ""
+
+    if constraint.is_simple():
+        return f"=={constraint}"
+
+    specifiers = []
+    if constraint.min is not None:
+        operator = ">=" if constraint.include_min else ">"
+        specifiers.append(f"{operator}{constraint.min}")
+
+    if constraint.max is not None:
+        operator = "<=" if constraint.include_max else "<"
+        specifiers.append(f"{operator}{constraint.max}")
+    return ",".join(specifiers)
+
+
+def _get_runtime_site_packages(runtime_root, python_version):
+    """Site-packages of runtime dependencies installed with '--prefix'.
+
+    Should be called after runtime dependencies are installed. Python used
+    to install them does not have to match 'python_version' (e.g. when
+    pyenv is not available), so existing directory is used if there is one.
+
+    Args:
+        runtime_root (str): Prefix where runtime dependencies are installed.
+        python_version (str): Python version of venv e.g. '3.9.13'.
+
+    Returns:
+        str: Path to runtime site-packages.
+    """
+
+    if IS_WINDOWS:
+        return os.path.join(runtime_root, "Lib", "site-packages")
+
+    # linux and macos create python{x}.{y} subfolder (should create
+    #   only one)
+    existing = glob.glob(
+        os.path.join(runtime_root, "lib", "python*", "site-packages")
+    )
+    if existing:
+        return sorted(existing)[0]
+
+    py_version_short = ".".join(python_version.split(".")[:2])
+    return os.path.join(
+        runtime_root, "lib", f"python{py_version_short}", "site-packages"
+    )
+
+
 def _install_runtime_dependencies(
-    runtime_dependencies, runtime_root, poetry_bin, env
+    runtime_dependencies, runtime_root, venv_path, env
 ):
     """Install runtime dependencies from 'full_toml_data' to 'output_root'.
 
     Args:
-        runtime_dependencies (dict[str, str]): Runtime dependencies with
-            requested versions.
+        runtime_dependencies (dict[str, Union[str, ConstraintClassesHint]]):
+            Runtime dependencies with requested versions. Versions can be
+            already parsed constraints.
         runtime_root (str): Path where runtime dependencies should be created.
-        poetry_bin (str): Path to poetry executable.
+        venv_path (str): Path to venv which python is used to run pip.
+        env (dict[str, str]): Environment variables for subprocess.
     """
 
     requirements_lines = []
     for package_name, package_version in runtime_dependencies.items():
-        parsed_version: VersionConstraint = parse_constraint(package_version)
-        if parsed_version.is_any():
-            package_version = ""
-        elif parsed_version.is_simple():
-            package_version = f"=={package_version}"
-        else:
-            min_ver = str(parsed_version.min)
-            if parsed_version.include_min:
-                min_ver = f">={min_ver}"
-            else:
-                min_ver = f">{min_ver}"
-            max_ver = str(parsed_version.max)
-            if parsed_version.include_max:
-                max_ver = f"<={max_ver}"
-            else:
-                max_ver = f"<{max_ver}"
-
-            package_version = f"{min_ver},{max_ver}"
-
-        requirements_lines.append(f"{package_name}{package_version}")
+        if isinstance(package_version, str):
+            package_version = _parse_constraint(package_version)
+        specifier = _constraint_to_requirement_specifier(package_version)
+        requirements_lines.append(f"{package_name}{specifier}")
 
     requiements_path = os.path.join(runtime_root, "requirements.txt")
     with open(requiements_path, "w") as stream:
         stream.write("\n".join(requirements_lines))
 
+    # Use venv python directly, 'poetry run' would only add poetry startup
+    python_executable = get_venv_executable(venv_path, "python")
     args = [
-        poetry_bin, "run",
-        "python", "-m", "pip", "install",
+        python_executable, "-m", "pip", "install",
         "--upgrade",
         "-r", requiements_path,
         "--prefix", str(runtime_root)
@@ -836,8 +1051,8 @@ def lock_to_toml_data(lock_path):
             f"{lock_path} doesn't exist. Provide path to real toml."
         )
 
-    with open(lock_path) as fp:
-        parsed = toml.load(fp)
+    with open(lock_path, "rb") as fp:
+        parsed = tomllib.load(fp)
 
     dependencies = {
         package_info["name"]: package_info["version"]
@@ -847,6 +1062,53 @@ def lock_to_toml_data(lock_path):
     return {"tool": {"poetry": {"dependencies": dependencies}}}
 
 
+def _remove_distribution_files(dist, venv_root):
+    """Remove files of installed distribution listed in its RECORD file.
+
+    Removes the same files as 'pip uninstall' would, without starting
+        pip. Folders which are empty after removal (or contain only
+        '__pycache__') are removed too.
+
+    Args:
+        dist (importlib.metadata.Distribution): Installed distribution.
+        venv_root (str): Path to venv. Files outside of venv are
+            not removed.
+
+    Returns:
+        bool: Files were removed. 'False' if distribution does not have
+            RECORD file and pip must be used.
+    """
+
+    if dist.read_text("RECORD") is None:
+        return False
+
+    venv_root = os.path.normcase(os.path.realpath(venv_root)) + os.sep
+    dirpaths = set()
+    for package_path in dist.files or []:
+        filepath = os.path.normpath(dist.locate_file(package_path))
+        # Resolve only location of the file itself, symlink is removed
+        #   and not its target
+        dirpath, filename = os.path.split(filepath)
+        real_filepath = os.path.join(os.path.realpath(dirpath), filename)
+        if not os.path.normcase(real_filepath).startswith(venv_root):
+            continue
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
+        dirpaths.add(os.path.dirname(filepath))
+
+    # Remove deeper folders first so parents can be removed after them
+    for dirpath in sorted(dirpaths, key=len, reverse=True):
+        try:
+            content = os.listdir(dirpath)
+        except OSError:
+            continue
+        if set(content) <= {"__pycache__"}:
+            shutil.rmtree(dirpath, ignore_errors=True)
+    return True
+
+
 def remove_existing_from_venv(
     addons_venv_path,
     installer,
@@ -866,9 +1128,9 @@ def remove_existing_from_venv(
             for testing
     """
 
-    pip_executable = get_venv_executable(addons_venv_path, "pip")
     print("Removing packages from venv")
-    for package_name in sorted(
+    package_names = set()
+    for package_name in (
         set(installer["pythonModules"])
         | set(installed_installer_runtime_deps)
     ):
@@ -876,75 +1138,235 @@ def remove_existing_from_venv(
         # TODO fix in ayon-launcher
         if package_name == "Babel":
             package_name = "babel"
+        package_names.add(package_name)
+
+    if not package_names:
+        return
+
+    package_names = sorted(package_names)
+    for package_name in package_names:
         print(f"- {package_name}")
+
+    dists_by_name = {}
+    for dist in distributions(
+        path=get_venv_site_packages(addons_venv_path)
+    ):
+        dist_name = dist.metadata["Name"]
+        if dist_name:
+            dists_by_name.setdefault(canonicalize_name(dist_name), dist)
+
+    # Remove files listed in RECORD of installed distributions directly,
+    #   pip is used only for distributions without RECORD file
+    #   (e.g. legacy '.egg-info' installations)
+    pip_package_names = []
+    for package_name in package_names:
+        dist = dists_by_name.get(canonicalize_name(package_name))
+        # Package is not installed
+        if dist is None:
+            continue
+        if not _remove_distribution_files(dist, addons_venv_path):
+            pip_package_names.append(package_name)
+
+    if not pip_package_names:
+        return
+
+    pip_executable = get_venv_executable(addons_venv_path, "pip")
+    # Uninstall all packages with single pip call, each pip process
+    #   has big startup overhead. Packages are passed in requirements file
+    #   as command line length is limited (especially on Windows).
+    with tempfile.NamedTemporaryFile(
+        "w", prefix="ayon_dep_uninstall", suffix=".txt", delete=False
+    ) as tmp:
+        tmp.write("\n".join(pip_package_names))
+        requirements_path = tmp.name
+
+    try:
         run_subprocess(
-            [pip_executable, "uninstall", package_name, "--yes"],
+            [pip_executable, "uninstall", "--yes", "-r", requirements_path],
             bound_output=False
         )
+    finally:
+        os.remove(requirements_path)
 
 
-def zip_venv(venv_folder, runtime_site_packages, zip_filepath):
-    """Zips newly created venv to single .zip file."""
-
-    site_packages_roots = get_venv_site_packages(venv_folder)
-    with ZipFileLongPaths(zip_filepath, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for site_packages_root in site_packages_roots:
-            sp_root_len_start = len(site_packages_root) + 1
-            for root, _, filenames in os.walk(site_packages_root):
-                # Care only about files
-                if not filenames:
-                    continue
+def _get_zip_compress_type(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in _STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
 
-                # Skip __pycache__ folders
-                root_name = os.path.basename(root)
-                if root_name == "__pycache__":
-                    continue
 
-                dst_root = "dependencies"
-                if len(root) > sp_root_len_start:
-                    dst_root = os.path.join(dst_root, root[sp_root_len_start:])
+def _iter_tree_zip_files(src_root, dst_root, skip_pycache):
+    """Walk directory tree with 'os.scandir' and yield files to zip.
 
-                for filename in filenames:
-                    src_path = os.path.join(root, filename)
-                    dst_path = os.path.join(dst_root, filename)
-                    zipf.write(src_path, dst_path)
+    Directory entries are used to check type of entries, so files don't
+    have to be stat-ed again. Symlinks to directories are not followed.
 
-        zip_runtime_root = "runtime"
-        for root, _, filenames in os.walk(runtime_site_packages):
-            # Care only about files
-            if not filenames:
+    Args:
+        src_root (str): Directory to walk.
+        dst_root (str): Path of the directory in zip.
+        skip_pycache (bool): Do not walk into '__pycache__' folders.
+
+    Yields:
+        tuple[str, str]: Source path and destination path in zip.
+    """
+
+    dirs = []
+    with os.scandir(src_root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if entry.is_symlink():
+                    continue
+                if skip_pycache and entry.name == "__pycache__":
+                    continue
+                dirs.append(entry)
                 continue
+            yield entry.path, os.path.join(dst_root, entry.name)
+
+    # Walk subfolders after the scandir iterator is closed
+    for entry in dirs:
+        yield from _iter_tree_zip_files(
+            entry.path, os.path.join(dst_root, entry.name), skip_pycache
+        )
+
 
-            dst_root = zip_runtime_root
-            if root != runtime_site_packages:
-                dst_root = os.path.join(
-                    dst_root, root[len(runtime_site_packages) + 1:]
-                )
+def _iter_venv_zip_files(venv_folder, runtime_site_packages):
+    """Source paths and paths in zip of files that should be zipped.
 
-            for filename in filenames:
-                src_path = os.path.join(root, filename)
-                dst_path = os.path.join(dst_root, filename)
-                zipf.write(src_path, dst_path)
+    Args:
+        venv_folder (str): Path to venv.
+        runtime_site_packages (str): Path to runtime dependencies.
+
+    Yields:
+        tuple[str, str]: Source path and destination path in zip.
+    """
+
+    for site_packages_root in get_venv_site_packages(venv_folder):
+        yield from _iter_tree_zip_files(
+            site_packages_root, "dependencies", True
+        )
+
+    if os.path.isdir(runtime_site_packages):
+        yield from _iter_tree_zip_files(
+            runtime_site_packages, "runtime", False
+        )
+
+
+def _compress_zip_file(src_path, dst_path):
+    """Read and compress file for zip.
+
+    Function is called in worker threads. Reading, crc and compression
+    release GIL so files are compressed in parallel. Uses 'isal' deflate
+    if available, output is the same deflate stream as from 'zlib'.
+
+    Args:
+        src_path (str): Path to file.
+        dst_path (str): Path in zip.
+
+    Returns:
+        tuple[str, str, Union[zipfile.ZipInfo, None], Union[bytes, None]]:
+            Source path, destination path, member info and compressed
+            data. Info and data are 'None' for big files which should be
+            written using 'ZipFile.write' to avoid keeping them in memory.
+    """
+
+    zinfo = zipfile.ZipInfo.from_file(src_path, dst_path)
+    if zinfo.file_size > _ZIP_MAX_PARALLEL_FILE_SIZE:
+        return src_path, dst_path, None, None
+
+    with open(src_path, "rb") as stream:
+        data = stream.read()
+
+    zinfo.file_size = len(data)
+    zinfo.CRC = deflate_zlib.crc32(data)
+    zinfo.compress_type = _get_zip_compress_type(src_path)
+    if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+        # Raw deflate stream as used in zip files
+        compressor = deflate_zlib.compressobj(
+            _ZIP_COMPRESS_LEVEL, zlib.DEFLATED, -15
+        )
+        data = compressor.compress(data) + compressor.flush()
+    zinfo.compress_size = len(data)
+    return src_path, dst_path, zinfo, data
+
+
+def _iter_compressed_zip_files(executor, filepaths, max_pending):
+    """Compress files in executor and yield results in original order.
+
+    Number of pending files is limited so compressed data of whole venv
+        are not held in memory.
+    """
+
+    pending = collections.deque()
+    for src_path, dst_path in filepaths:
+        pending.append(
+            executor.submit(_compress_zip_file, src_path, dst_path)
+        )
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def zip_venv(venv_folder, runtime_site_packages, zip_filepath):
+    """Zips newly created venv to single .zip file.
+
+    Files are compressed with fast compression level, already compressed
+        files (e.g. images or archives) are stored without compression.
+        Compression runs in multiple threads, the zip file is written
+        in main thread.
+
+    Args:
+        venv_folder (str): Path to venv.
+        runtime_site_packages (str): Path to runtime dependencies.
+        zip_filepath (Union[str, BinaryIO]): Path to output zip file or
+            writable binary stream.
+    """
+
+    filepaths = _iter_venv_zip_files(venv_folder, runtime_site_packages)
+    max_workers = os.cpu_count() or 1
+    with ZipFileLongPaths(
+        zip_filepath, "w", zipfile.ZIP_DEFLATED,
+        compresslevel=_ZIP_COMPRESS_LEVEL
+    ) as zipf, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for src_path, dst_path, zinfo, data in _iter_compressed_zip_files(
+            executor, filepaths, max_workers * 2
+        ):
+            if zinfo is not None:
+                zipf.write_compressed(zinfo, data)
+                continue
+
+            zipf.write(
+                src_path,
+                dst_path,
+                compress_type=_get_zip_compress_type(src_path)
+            )
 
 
 def prepare_zip_venv(venv_path, runtime_site_packages, output_root):
     """Handles creation of zipped venv.
 
+    Hash and size of zip file are calculated while the file is written.
+
     Args:
         venv_path (str): Path to created venv.
         runtime_site_packages (str): Path to runtime dependencies.
         output_root (str): Temp folder path.
 
     Returns:
-        (str) path to zipped venv
+        tuple[str, str, int]: Path to zipped venv, its sha256 checksum
+            and size.
     """
 
     zip_file_name = f"{create_dependency_package_basename()}.zip"
     venv_zip_path = os.path.join(output_root, zip_file_name)
     print(f"Zipping new venv to {venv_zip_path}")
-    zip_venv(venv_path, runtime_site_packages, venv_zip_path)
+    with open(venv_zip_path, "wb") as stream:
+        writer = HashingWriter(stream, "sha256")
+        zip_venv(venv_path, runtime_site_packages, writer)
 
-    return venv_zip_path
+    return venv_zip_path, writer.hexdigest(), writer.size
 
 
 def get_applicable_package(
@@ -964,51 +1386,123 @@ def get_applicable_package(
         Union[dict[str, Any], None]: Data of matching package.
     """
 
-    toml_python_packages = dict(
-        sorted(new_toml["tool"]["poetry"]["dependencies"].items())
-    )
+    # Dictionary comparison does not depend on order of keys, sorting is
+    #   not needed
+    toml_python_packages = new_toml["tool"]["poetry"]["dependencies"]
     for package in con.get_dependency_packages()["packages"]:
-        package_python_packages = dict(sorted(
-            package["pythonModules"].items())
-        )
-        if toml_python_packages == package_python_packages:
+        package_python_packages = package["pythonModules"]
+        if (
+            len(package_python_packages) == len(toml_python_packages)
+            and package_python_packages == toml_python_packages
+        ):
             return package
 
 
-def get_python_modules(venv_path: str) -> Dict[str, str]:
-    """Uses pip freeze to get installed libraries from `venv_path`.
+def _get_direct_url_version(dist) -> Union[str, None]:
+    """Url of package installed from url, vcs or directory.
+
+    Matches url which is shown by 'pip freeze' as 'name @ url'.
+
+    Args:
+        dist (importlib.metadata.Distribution): Installed distribution.
+
+    Returns:
+        Union[str, None]: Url or None if package was installed from index.
+    """
+
+    content = dist.read_text("direct_url.json")
+    if not content:
+        return None
+
+    try:
+        direct_url = json.loads(content)
+    except ValueError:
+        return None
+
+    url = direct_url.get("url")
+    if not url:
+        return None
+
+    vcs_info = direct_url.get("vcs_info")
+    if vcs_info:
+        url = f"{vcs_info['vcs']}+{url}"
+        commit_id = vcs_info.get("commit_id")
+        if commit_id:
+            url = f"{url}@{commit_id}"
+        return url
+
+    archive_hash = (direct_url.get("archive_info") or {}).get("hash")
+    if archive_hash:
+        url = f"{url}#{archive_hash}"
+    return url
+
+
+def _get_freeze_skip_packages(
+    python_version: Optional[str]
+) -> FrozenSet[str]:
+    """Packages hidden by 'pip freeze' for python version.
+
+    Pip does not list 'setuptools', 'wheel' and 'distribute' only
+        on Python < 3.12.
+
+    Args:
+        python_version (Optional[str]): Python version of venv
+            e.g. '3.9.13'. Python < 3.12 is expected if not passed.
+
+    Returns:
+        frozenset[str]: Canonical names of skipped packages.
+    """
+
+    if python_version:
+        version_parts = python_version.split(".")[:2]
+        try:
+            if tuple(int(part) for part in version_parts) >= (3, 12):
+                return _FREEZE_SKIP_PACKAGES
+        except ValueError:
+            pass
+    return _FREEZE_SKIP_PACKAGES_LEGACY
+
+
+def get_python_modules(
+    venv_path: str, python_version: Optional[str] = None
+) -> Dict[str, str]:
+    """Get installed libraries from `venv_path`.
+
+    Distributions metadata in venv site-packages are read directly, same
+        packages as 'pip freeze' lists are returned.
 
     Args:
         venv_path (str): absolute path to created dependency package already
             with removed libraries from installer package
+        python_version (Optional[str]): Python version of venv
+            e.g. '3.9.13'. Decides which packages are hidden same as
+            'pip freeze' does.
 
     Returns:
         dict[str, str] {'acre': '1.0.0',...}
     """
 
-    pip_executable: str = get_venv_executable(venv_path, "pip")
-
-    process: subprocess.Popen = subprocess.Popen(
-        [pip_executable, "freeze", venv_path, "--no-color"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
-    _stdout, _stderr = process.communicate()
-    if process.returncode != 0:
-        raise RuntimeError(f"Failed to freeze pip packages.")
-
+    skip_packages = _get_freeze_skip_packages(python_version)
     packages = {}
-    for line in _stdout.decode("utf-8").split("\n"):
-        line = line.strip()
-        if not line:
+    found_names = set()
+    for dist in distributions(path=get_venv_site_packages(venv_path)):
+        package_name = dist.metadata["Name"]
+        if not package_name:
+            continue
+
+        # First found distribution is used, same as import system does
+        normalized_name = canonicalize_name(package_name)
+        if (
+            normalized_name in found_names
+            or normalized_name in skip_packages
+        ):
             continue
+        found_names.add(normalized_name)
 
-        match = re.match(r"^(.+?)(?:==|>=|<=|~=|!=|@)(.+)$", line)
-        if match:
-            package_name, package_version = match.groups()
-            packages[package_name.rstrip()] = package_version.lstrip()
-        else:
-            packages[line] = None
+        package_version = _get_direct_url_version(dist)
+        if package_version is None:
+            package_version = dist.version
+        packages[package_name] = package_version
 
     print("Installed python modules:")
     for package in sorted(packages):
@@ -1027,9 +1521,13 @@ def calculate_hash(filepath):
         str: File sha256 hashs.
     """
 
-    checksum = hashlib.sha256()
     with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        # 'hashlib.file_digest' is available since Python 3.11
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        checksum = hashlib.sha256()
+        for chunk in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
             checksum.update(chunk)
     return checksum.hexdigest()
 
@@ -1039,6 +1537,9 @@ def prepare_package_data(
     bundle: Bundle,
     platform_name: str,
     runtime_dependencies: Dict[str, str],
+    checksum: Optional[str] = None,
+    file_size: Optional[int] = None,
+    python_version: Optional[str] = None,
 ):
     """Creates package data for server.
 
@@ -1050,18 +1551,27 @@ def prepare_package_data(
         platform_name (str): Platform name.
         runtime_dependencies (dict[str, str]): Runtime dependencies with
             requested versions.
+        checksum (Optional[str]): Already calculated sha256 checksum of
+            zipped venv. Calculated from the file if not passed.
+        file_size (Optional[int]): Size of zipped venv. Taken from the file
+            if not passed.
+        python_version (Optional[str]): Python version of installer
+            e.g. '3.9.13'.
 
     Returns:
         dict[str, Any]: Dependency package information.
     """
 
     venv_path = os.path.join(os.path.dirname(venv_zip_path), ".venv")
-    python_modules = get_python_modules(venv_path)
+    python_modules = get_python_modules(venv_path, python_version)
     # Runtime dependencies do not have special key
     python_modules.update(runtime_dependencies)
 
     package_name = os.path.basename(venv_zip_path)
-    checksum = calculate_hash(venv_zip_path)
+    if checksum is None:
+        checksum = calculate_hash(venv_zip_path)
+    if file_size is None:
+        file_size = os.stat(venv_zip_path).st_size
 
     return {
         "filename": package_name,
@@ -1070,7 +1580,7 @@ def prepare_package_data(
         "installer_version": bundle.installer_version,
         "checksum": checksum,
         "checksum_algorithm": "sha256",
-        "file_size": os.stat(venv_zip_path).st_size,
+        "file_size": file_size,
         "platform_name": platform_name,
     }
 
@@ -1093,7 +1603,8 @@ def stored_package_to_dir(output_dir, venv_zip_path, bundle, package_data):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    new_package_data = copy.deepcopy(package_data)
+    # Only top level keys are changed, shallow copy is enough
+    new_package_data = dict(package_data)
     # Change data to match server requirements
     new_package_data["platform"] = new_package_data.pop("platform_name")
     new_package_data["size"] = new_package_data.pop("file_size")
@@ -1102,10 +1613,18 @@ def stored_package_to_dir(output_dir, venv_zip_path, bundle, package_data):
 
     filename = new_package_data["filename"]
     output_path = os.path.join(output_dir, filename)
-    shutil.copy(venv_zip_path, output_path)
+    shutil.copyfile(venv_zip_path, output_path)
     metadata_path = output_path + ".json"
-    with open(metadata_path, "w") as stream:
-        json.dump(new_package_data, stream, indent=4)
+    # Both branches produce the same output, 'orjson' supports only
+    #   indentation with 2 spaces
+    if orjson is not None:
+        content = orjson.dumps(new_package_data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(
+            new_package_data, indent=2, ensure_ascii=False
+        ).encode("utf-8")
+    with open(metadata_path, "wb") as stream:
+        stream.write(content)
 
 
 def upload_to_server(con, venv_zip_path, package_data):
@@ -1139,8 +1658,10 @@ def update_bundle_with_package(con, bundle, package_data):
     package_name = package_data["filename"]
     print(f"Updating in {bundle.name} with {package_name}")
     platform_name = package_data["platform_name"]
-    dependency_packages = copy.deepcopy(bundle.dependency_packages)
-    dependency_packages[platform_name] = package_name
+    dependency_packages = {
+        **bundle.dependency_packages,
+        platform_name: package_name,
+    }
     con.update_bundle(bundle.name, dependency_packages)
 
 
@@ -1193,6 +1714,32 @@ def get_runtime_dependencies(
         os.remove(output_path)
 
 
+def _iter_tree_files(dirpath):
+    """Iterate paths to files in directory tree.
+
+    Args:
+        dirpath (str): Path to directory.
+
+    Yields:
+        str: Path to file or symlink.
+    """
+
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_tree_files(entry.path)
+            else:
+                yield entry.path
+
+
+def _try_remove_file(filepath):
+    try:
+        os.remove(filepath)
+        return None
+    except OSError:
+        return filepath
+
+
 def _remove_tmpdir(tmpdir):
     """Safer removement of temp directory.
 
@@ -1204,36 +1751,83 @@ def _remove_tmpdir(tmpdir):
         tmpdir (str): Path to temp directory.
     """
 
-    failed = []
     if not os.path.exists(tmpdir):
-        return failed
+        return []
+
+    # Files are removed in multiple threads while the tree is walked,
+    #   failed files are tried again after all other files
+    with ThreadPoolExecutor(max_workers=_REMOVE_MAX_WORKERS) as executor:
+        remaining = _iter_tree_files(tmpdir)
+        for _ in range(_REMOVE_ATTEMPTS):
+            remaining = [
+                filepath
+                for filepath in executor.map(_try_remove_file, remaining)
+                if filepath is not None
+            ]
+            if not remaining:
+                break
+
+    failed = remaining
+    if not failed:
+        shutil.rmtree(tmpdir)
+    return failed
 
-    filepaths = set()
-    for root, dirnames, filenames in os.walk(tmpdir):
-        for filename in filenames:
-            filepaths.add(os.path.join(root, filename))
 
-    remove_queue = collections.deque()
-    for filepath in filepaths:
-        remove_queue.append((filepath, 0))
+def _cleanup_tmpdir(tmpdir):
+    print(">>> Cleaning up processing directory {}".format(tmpdir))
+    failed_paths = _remove_tmpdir(tmpdir)
+    if failed_paths:
+        print("Failed to cleanup tempdir: {}".format(tmpdir))
+        print("\n".join(sorted(failed_paths)))
 
-    while remove_queue:
-        (filepath, attempt) = remove_queue.popleft()
-        try:
-            os.remove(filepath)
-        except OSError:
-            if attempt > 3:
-                failed.append(filepath)
-            else:
-                remove_queue.append((filepath, attempt + 1))
 
-    if not failed:
-        shutil.rmtree(tmpdir)
-    return failed
+def _cleanup_tmpdir_in_background(tmpdir):
+    """Remove processing directory in a background thread.
+
+    Thread is not a daemon so the process waits for the cleanup to finish
+        before exit.
+
+    Args:
+        tmpdir (str): Path to temp directory.
+    """
+
+    thread = threading.Thread(
+        target=_cleanup_tmpdir,
+        args=(tmpdir, ),
+        name=f"cleanup-{os.path.basename(tmpdir)}",
+    )
+    with _CLEANUP_THREADS_LOCK:
+        _CLEANUP_THREADS[:] = [
+            cleanup_thread
+            for cleanup_thread in _CLEANUP_THREADS
+            if cleanup_thread.is_alive()
+        ]
+        _CLEANUP_THREADS.append(thread)
+    thread.start()
+
+
+def wait_cleanups():
+    """Wait for background cleanup of processing directories.
+
+    Processing directories of created packages are removed in background
+        threads, so 'create_package' can return before they are removed.
+    """
+
+    with _CLEANUP_THREADS_LOCK:
+        threads = list(_CLEANUP_THREADS)
+        _CLEANUP_THREADS.clear()
+
+    for thread in threads:
+        thread.join()
 
 
 def _create_package(
-    bundle_name, con, skip_upload, output_root, destination_root=None
+    bundle_name,
+    con,
+    skip_upload,
+    output_root,
+    destination_root=None,
+    verbose=False,
 ):
     bundles_by_name = get_bundles(con)
 
@@ -1248,7 +1842,7 @@ def _create_package(
         print(f"Bundle '{bundle.name}' does not have set installer.")
         return None
 
-    platform_name = platform.system().lower()
+    platform_name = PLATFORM_NAME
     installer = find_installer_by_name(
         con, bundle_name, bundle.installer_version, platform_name
     )
@@ -1259,7 +1853,13 @@ def _create_package(
 
     venv_info = prepare_new_venv(output_root, installer)
 
-    solve_dependencies(full_toml_data, output_root, venv_info.venv_path)
+    # Solver imports poetry installer internals which is slow, import it
+    #   only when a package is created
+    from .custom_solver import solve_dependencies
+
+    solve_dependencies(
+        full_toml_data, output_root, venv_info.venv_path, verbose
+    )
 
     applicable_package = get_applicable_package(con, full_toml_data)
     if applicable_package:
@@ -1283,15 +1883,23 @@ def _create_package(
         runtime_site_packages, venv_info.venv_path
     )
 
-    venv_zip_path = prepare_zip_venv(
+    venv_zip_path, checksum, file_size = prepare_zip_venv(
         venv_info.venv_path,
         runtime_site_packages,
         output_root,
     )
 
     package_data = prepare_package_data(
-        venv_zip_path, bundle, platform_name, runtime_dependencies
+        venv_zip_path,
+        bundle,
+        platform_name,
+        runtime_dependencies,
+        checksum,
+        file_size,
+        installer["pythonVersion"],
     )
+    # Copy before upload so failed copy does not leave uploaded package
+    #   which is not assigned to bundle
     if destination_root:
         stored_package_to_dir(
             destination_root, venv_zip_path, bundle, package_data
@@ -1304,7 +1912,13 @@ def _create_package(
     return package_data["filename"]
 
 
-def create_package(bundle_name, con=None, output_dir=None, skip_upload=False):
+def create_package(
+    bundle_name,
+    con=None,
+    output_dir=None,
+    skip_upload=False,
+    verbose=False,
+):
     """Pulls all active addons info from server and create dependency package.
 
     1. Takes base (installer) pyproject.toml, and adds tomls from addons
@@ -1319,6 +1933,8 @@ def create_package(bundle_name, con=None, output_dir=None, skip_upload=False):
         output_dir (Optional[str]): Path to directory where package will be
             created.
         skip_upload (Optional[bool]): Skip upload to server. Default: False.
+        verbose (Optional[bool]): Print output of dependency solver.
+            Default: False.
     """
 
     # create resolved venv based on distributed venv with Desktop + activated
@@ -1330,13 +1946,52 @@ def create_package(bundle_name, con=None, output_dir=None, skip_upload=False):
     try:
         if con is None:
             con = ayon_api.get_server_api_connection()
-        return _create_package(
-            bundle_name, con, skip_upload, tmpdir, output_dir
+        filename = _create_package(
+            bundle_name, con, skip_upload, tmpdir, output_dir, verbose
         )
 
-    finally:
-        print(">>> Cleaning up processing directory {}".format(tmpdir))
-        failed_paths = _remove_tmpdir(tmpdir)
-        if failed_paths:
-            print("Failed to cleanup tempdir: {}".format(tmpdir))
-            print("\n".join(sorted(failed_paths)))
+    except BaseException:
+        _cleanup_tmpdir(tmpdir)
+        raise
+
+    # Package is ready, caller does not have to wait for the cleanup
+    _cleanup_tmpdir_in_background(tmpdir)
+    return filename
+
+
+def create_packages(
+    bundle_names,
+    con=None,
+    output_dir=None,
+    skip_upload=False,
+    verbose=False,
+):
+    """Create dependency packages for multiple bundles.
+
+    Bundles are processed one after another. Package filenames are based
+        on time with minute resolution, and poetry and python installation
+        steps share files, so packages are not created in parallel.
+
+    Args:
+        bundle_names (Iterable[str]): Names of bundles for which are
+            packages created.
+        con (Optional[ayon_api.ServerAPI]): Prepared server API object.
+        output_dir (Optional[str]): Path to directory where packages will be
+            created.
+        skip_upload (Optional[bool]): Skip upload to server. Default: False.
+        verbose (Optional[bool]): Print output of dependency solver.
+            Default: False.
+
+    Returns:
+        dict[str, Union[str, None]]: Package filename by bundle name.
+    """
+
+    if con is None:
+        con = ayon_api.get_server_api_connection()
+
+    return {
+        bundle_name: create_package(
+            bundle_name, con, output_dir, skip_upload, verbose
+        )
+        for bundle_name in dict.fromkeys(bundle_names)
+    }
@@ -1,6 +1,5 @@
 import os
 import sys
-import copy
 from pathlib import Path
 
 import toml
@@ -51,40 +50,76 @@ def create_io() -> IO:
     return io
 
 
-def solve_dependencies(full_toml_data, output_root: str, venv_path: str):
+def solve_dependencies(
+    full_toml_data,
+    output_root: str,
+    venv_path: str,
+    verbose: bool = False,
+):
     output_root = Path(output_root)
     venv_path = Path(venv_path)
 
-    all_dependencies = copy.deepcopy(full_toml_data)
-    runtime_dependencies = all_dependencies["ayon"]["runtimeDependencies"]
+    runtime_dependencies = full_toml_data["ayon"]["runtimeDependencies"]
     if not runtime_dependencies:
         return
 
-    all_main_dependencies = all_dependencies["tool"]["poetry"]["dependencies"]
-    all_main_dependencies.update(runtime_dependencies)
-    resolved_all_versions = _solve_dependencies(
-        all_dependencies, output_root, venv_path
+    # Copy only dictionaries that are changed, deeper structures can be
+    #   shared with the original data
+    tool_data = full_toml_data["tool"]
+    poetry_data = tool_data["poetry"]
+    all_dependencies = dict(full_toml_data)
+    all_dependencies["tool"] = {
+        **tool_data,
+        "poetry": {
+            **poetry_data,
+            "dependencies": {
+                **poetry_data["dependencies"],
+                **runtime_dependencies,
+            },
+        },
+    }
+    # Reuse repository pool for second solve so package metadata already
+    #   fetched by repositories are not fetched and parsed again
+    resolved_all_versions, pool = _solve_dependencies(
+        all_dependencies, output_root, venv_path, verbose=verbose
     )
 
+    # Resolved packages use canonical names, names in toml data don't have
+    #   to be canonical (e.g. 'PyYAML' is resolved as 'pyyaml')
     main_dependencies = full_toml_data["tool"]["poetry"]["dependencies"]
+    main_names = set()
     for package_name in tuple(main_dependencies.keys()):
-        version = resolved_all_versions.get(package_name)
+        canonical_name = canonicalize_name(package_name)
+        main_names.add(canonical_name)
+        version = resolved_all_versions.get(canonical_name)
         if version is None:
             continue
         main_dependencies[package_name] = version
 
-    resolved_base_versions = _solve_dependencies(
-        full_toml_data, output_root, venv_path
+    resolved_base_versions, _ = _solve_dependencies(
+        full_toml_data, output_root, venv_path, pool, verbose
     )
     runtime_dependencies = full_toml_data["ayon"]["runtimeDependencies"]
+    runtime_names = {
+        canonicalize_name(package_name): package_name
+        for package_name in runtime_dependencies
+    }
     for package_name, package_version in resolved_base_versions.items():
-        if package_name not in main_dependencies:
+        if package_name not in main_names:
             main_dependencies[package_name] = package_version
 
-        runtime_dependencies.pop(package_name, None)
+        runtime_name = runtime_names.get(package_name)
+        if runtime_name is not None:
+            runtime_dependencies.pop(runtime_name)
 
 
-def _solve_dependencies(toml_data, output_root: Path, venv_path: Path):
+def _solve_dependencies(
+    toml_data,
+    output_root: Path,
+    venv_path: Path,
+    pool: RepositoryPool = None,
+    verbose: bool = False,
+):
     pyproject_toml_path = output_root / "pyproject.toml"
     with open(pyproject_toml_path, "w") as stream:
         toml.dump(toml_data, stream)
@@ -95,13 +130,17 @@ def _solve_dependencies(toml_data, output_root: Path, venv_path: Path):
         disable_plugins=False,
         disable_cache=False,
     )
+    if pool is None:
+        pool = poetry.pool
     env = VirtualEnv(Path(venv_path))
+    # Solver writes a line on each step, output is not read unless verbose
+    io = create_io() if verbose else NullIO()
     installer = CustomResolver(
-        create_io(),
+        io,
         env,
         poetry.package,
         poetry.locker,
-        poetry.pool,
+        pool,
         poetry.config,
         disable_cache=poetry.disable_cache,
     )
@@ -115,11 +154,14 @@ def _solve_dependencies(toml_data, output_root: Path, venv_path: Path):
 
         output[package.name] = version
     os.remove(pyproject_toml_path)
-    return output
+    return output, pool
 
 
 class CustomResolver(Installer):
-    ops = []
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ops = []
+
     def _do_install(self) -> int:
         from poetry.puzzle.solver import Solver
 
@@ -204,8 +246,18 @@ class CustomResolver(Installer):
         # Making a new repo containing the packages
         # newly resolved and the ones from the current lock file
         repo = Repository("poetry-repo")
-        for package in lockfile_repo.packages + locked_repository.packages:
-            if not package.is_direct_origin() and not repo.has_package(package):
+        # Track added packages by the same key as 'Repository.has_package'
+        #   which scans all packages of the repository on each call
+        added_packages = set()
+        for packages in (lockfile_repo.packages, locked_repository.packages):
+            for package in packages:
+                unique_name = package.unique_name
+                if (
+                    unique_name in added_packages
+                    or package.is_direct_origin()
+                ):
+                    continue
+                added_packages.add(unique_name)
                 repo.add_package(package)
 
         pool.add_repository(repo)
@@ -0,0 +1,65 @@
+import copy
+
+from ..core import tomllib, get_full_toml, _parse_addon_toml
+
+ADDON_TOML = """
+[tool.poetry.dependencies]
+requests = "^2.25"
+qtpy = { git = "https://github.com/spyder-ide/qtpy.git", rev = "v2.3.0" }
+
+[ayon.runtimeDependencies]
+six = "^1.15"
+opencolorio = { windows = "2.2.0", linux = "2.2.1", darwin = "2.2.1" }
+"""
+
+
+def _base_toml_data():
+    return {
+        "tool": {
+            "poetry": {
+                "dependencies": {
+                    "python": ">=3.9.1,<3.10",
+                    "requests": "^2.28",
+                },
+            },
+        },
+        "ayon": {"runtimeDependencies": {}},
+    }
+
+
+def test_get_full_toml_does_not_modify_cached_addon_toml():
+    """Parsed addon tomls are cached and shared between bundles."""
+    expected = tomllib.loads(ADDON_TOML)
+    cached = _parse_addon_toml(ADDON_TOML)
+    assert cached == expected
+
+    for platform_name in ("windows", "linux"):
+        full_toml = get_full_toml(
+            _base_toml_data(), {"addon_1.0.0": ADDON_TOML}, platform_name
+        )
+        dependencies = full_toml["tool"]["poetry"]["dependencies"]
+        # Modify merged data as following steps of package creation do
+        dependencies["qtpy"]["rev"] = "modified"
+        full_toml["ayon"]["runtimeDependencies"].clear()
+
+    assert _parse_addon_toml(ADDON_TOML) is cached
+    assert cached == expected
+
+
+def test_get_full_toml_merges_cached_addon_toml():
+    """Merged result is same for each call with cached addon toml."""
+    results = [
+        get_full_toml(
+            _base_toml_data(), {"addon_1.0.0": ADDON_TOML}, "linux"
+        )
+        for _ in range(2)
+    ]
+    first, second = copy.deepcopy(results)
+
+    assert first == second
+    dependencies = first["tool"]["poetry"]["dependencies"]
+    assert dependencies["qtpy"] == {
+        "git": "https://github.com/spyder-ide/qtpy.git", "rev": "v2.3.0"
+    }
+    runtime_dependencies = first["ayon"]["runtimeDependencies"]
+    assert set(runtime_dependencies) == {"six", "opencolorio"}
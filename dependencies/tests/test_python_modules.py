@@ -0,0 +1,141 @@
+import os
+import sys
+import glob
+import json
+import platform
+import subprocess
+
+import pytest
+
+from .. import core
+from ..core import get_python_modules
+from ..utils import get_venv_executable, get_venv_site_packages
+
+
+def _create_dist_info(site_packages, name, version, files=None):
+    """Create minimal '.dist-info' metadata of installed distribution."""
+    dist_info = os.path.join(site_packages, f"{name}-{version}.dist-info")
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, "METADATA"), "w") as stream:
+        stream.write(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        )
+    for filename, content in (files or {}).items():
+        with open(os.path.join(dist_info, filename), "w") as stream:
+            stream.write(content)
+    return dist_info
+
+
+@pytest.fixture
+def fake_venv(tmpdir):
+    venv_path = os.path.join(str(tmpdir), ".venv")
+    site_packages = os.path.join(
+        venv_path, "lib", "python3.9", "site-packages"
+    )
+    os.makedirs(site_packages)
+    return venv_path, site_packages
+
+
+@pytest.mark.parametrize(
+    "python_version, expected",
+    [
+        ("3.9.13", {"acre"}),
+        ("3.11.7", {"acre"}),
+        ("3.12.1", {"acre", "setuptools", "wheel", "distribute"}),
+        ("3.13.0", {"acre", "setuptools", "wheel", "distribute"}),
+    ]
+)
+def test_get_python_modules_skipped_packages(
+    fake_venv, python_version, expected
+):
+    """'pip' is always skipped, other packages only on Python < 3.12."""
+    venv_path, site_packages = fake_venv
+    for name in ("acre", "pip", "setuptools", "wheel", "distribute"):
+        _create_dist_info(site_packages, name, "1.0.0")
+
+    python_modules = get_python_modules(venv_path, python_version)
+
+    assert set(python_modules) == expected
+
+
+def test_get_python_modules_match_pip_freeze(tmpdir):
+    """Output matches 'pip freeze' of real venv."""
+    pytest.importorskip("ensurepip")
+    venv_path = os.path.join(str(tmpdir), ".venv")
+    subprocess.check_call([sys.executable, "-m", "venv", venv_path])
+
+    site_packages = get_venv_site_packages(venv_path)[0]
+    # Make sure packages hidden on older pythons are installed
+    for name in ("acre", "setuptools", "wheel"):
+        pattern = os.path.join(site_packages, f"{name}-*.dist-info")
+        if not glob.glob(pattern):
+            _create_dist_info(site_packages, name, "1.0.0")
+
+    output = subprocess.check_output(
+        [get_venv_executable(venv_path, "python"), "-m", "pip", "freeze"],
+        universal_newlines=True,
+    )
+    frozen = {}
+    for line in output.splitlines():
+        name, _, version = line.partition("==")
+        frozen[name] = version
+
+    python_modules = get_python_modules(
+        venv_path, platform.python_version()
+    )
+
+    assert python_modules == frozen
+
+
+def test_get_python_modules_versions(fake_venv):
+    """Versions of index, vcs and archive installations."""
+    venv_path, site_packages = fake_venv
+    _create_dist_info(site_packages, "acre", "1.0.0")
+    _create_dist_info(
+        site_packages,
+        "ayon_api",
+        "1.0.0",
+        {"direct_url.json": json.dumps({
+            "url": "https://github.com/ynput/ayon-python-api.git",
+            "vcs_info": {"vcs": "git", "commit_id": "0123abcd"},
+        })},
+    )
+    _create_dist_info(
+        site_packages,
+        "Qt.py",
+        "1.3.0",
+        {"direct_url.json": json.dumps({
+            "url": "https://example.com/Qt.py-1.3.0.tar.gz",
+            "archive_info": {"hash": "sha256=abcdef"},
+        })},
+    )
+
+    python_modules = get_python_modules(venv_path, "3.9.13")
+
+    assert python_modules == {
+        "acre": "1.0.0",
+        "ayon_api": (
+            "git+https://github.com/ynput/ayon-python-api.git@0123abcd"
+        ),
+        "Qt.py": "https://example.com/Qt.py-1.3.0.tar.gz#sha256=abcdef",
+    }
+
+
+def test_get_python_modules_duplicated_distribution(tmpdir, monkeypatch):
+    """First found distribution of the same name is used."""
+    first_site_packages = os.path.join(str(tmpdir), "first")
+    second_site_packages = os.path.join(str(tmpdir), "second")
+    os.makedirs(first_site_packages)
+    os.makedirs(second_site_packages)
+    _create_dist_info(first_site_packages, "acre", "1.0.0")
+    _create_dist_info(second_site_packages, "Acre", "0.9.0")
+    _create_dist_info(second_site_packages, "six", "1.16.0")
+    monkeypatch.setattr(
+        core,
+        "get_venv_site_packages",
+        lambda _: [first_site_packages, second_site_packages],
+    )
+
+    python_modules = get_python_modules(str(tmpdir), "3.9.13")
+
+    assert python_modules == {"acre": "1.0.0", "six": "1.16.0"}
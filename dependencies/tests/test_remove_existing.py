@@ -0,0 +1,156 @@
+import os
+from importlib.metadata import distributions
+
+import pytest
+
+from .. import core
+from ..core import remove_existing_from_venv, _remove_distribution_files
+from ..utils import get_venv_executable
+
+
+def _write_file(path, content=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as stream:
+        stream.write(content)
+
+
+def _create_distribution(site_packages, name, files, record=True):
+    """Create installed distribution with files listed in RECORD.
+
+    Args:
+        site_packages (str): Path to site-packages.
+        name (str): Distribution name.
+        files (list[str]): Absolute paths to files of distribution.
+        record (bool): Create RECORD file.
+    """
+
+    dist_info_name = f"{name}-1.0.0.dist-info"
+    dist_info = os.path.join(site_packages, dist_info_name)
+    _write_file(
+        os.path.join(dist_info, "METADATA"),
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0.0\n",
+    )
+    record_lines = []
+    for path in files:
+        _write_file(path, "content")
+        relpath = os.path.relpath(path, site_packages)
+        record_lines.append(f"{relpath.replace(os.sep, '/')},,")
+
+    if record:
+        record_lines.append(f"{dist_info_name}/METADATA,,")
+        record_lines.append(f"{dist_info_name}/RECORD,,")
+        _write_file(
+            os.path.join(dist_info, "RECORD"), "\n".join(record_lines)
+        )
+    return dist_info
+
+
+def _get_distribution(site_packages, name):
+    for dist in distributions(path=[site_packages]):
+        if dist.metadata["Name"] == name:
+            return dist
+    raise AssertionError(f"Distribution {name} not found")
+
+
+@pytest.fixture
+def fake_venv(tmpdir):
+    venv_path = os.path.join(str(tmpdir), ".venv")
+    site_packages = os.path.join(
+        venv_path, "lib", "python3.9", "site-packages"
+    )
+    os.makedirs(site_packages)
+    return venv_path, site_packages
+
+
+def test_remove_distribution_files(fake_venv, tmpdir):
+    """Files listed in RECORD are removed, files outside venv are kept."""
+    venv_path, site_packages = fake_venv
+    package_files = [
+        os.path.join(site_packages, "acre", "__init__.py"),
+        os.path.join(site_packages, "acre", "lib", "core.py"),
+        os.path.join(site_packages, "acre_module.py"),
+        os.path.join(venv_path, "bin", "acre"),
+    ]
+    outside_file = os.path.join(str(tmpdir), "outside.txt")
+    dist_info = _create_distribution(
+        site_packages, "acre", package_files + [outside_file]
+    )
+    # Cache files are not listed in RECORD
+    _write_file(
+        os.path.join(site_packages, "acre", "__pycache__", "core.pyc")
+    )
+    other_file = os.path.join(site_packages, "other", "__init__.py")
+    _write_file(other_file)
+
+    dist = _get_distribution(site_packages, "acre")
+    assert _remove_distribution_files(dist, venv_path) is True
+
+    for path in package_files:
+        assert not os.path.exists(path), f"{path} should be removed"
+    assert not os.path.exists(os.path.join(site_packages, "acre"))
+    assert not os.path.exists(dist_info)
+    assert os.path.exists(outside_file), "File outside venv must be kept"
+    assert os.path.exists(other_file), "Other package must be kept"
+
+
+def test_remove_distribution_files_without_record(fake_venv):
+    """Distribution without RECORD is not changed."""
+    venv_path, site_packages = fake_venv
+    module_path = os.path.join(site_packages, "legacy.py")
+    dist_info = _create_distribution(
+        site_packages, "legacy", [module_path], record=False
+    )
+
+    dist = _get_distribution(site_packages, "legacy")
+    assert _remove_distribution_files(dist, venv_path) is False
+
+    assert os.path.exists(module_path)
+    assert os.path.exists(dist_info)
+
+
+def test_remove_existing_from_venv_pip_fallback(fake_venv, monkeypatch):
+    """Pip uninstalls only distributions without RECORD."""
+    venv_path, site_packages = fake_venv
+    acre_path = os.path.join(site_packages, "acre.py")
+    legacy_path = os.path.join(site_packages, "legacy.py")
+    _create_distribution(site_packages, "acre", [acre_path])
+    _create_distribution(
+        site_packages, "legacy", [legacy_path], record=False
+    )
+
+    calls = []
+
+    def run_subprocess(args, **kwargs):
+        with open(args[-1]) as stream:
+            calls.append((args[:-1], stream.read().splitlines()))
+
+    monkeypatch.setattr(core, "run_subprocess", run_subprocess)
+
+    installer = {"pythonModules": {"acre": "1.0.0", "legacy": "1.0.0"}}
+    remove_existing_from_venv(venv_path, installer, {"missing"})
+
+    assert not os.path.exists(acre_path)
+    pip_executable = get_venv_executable(venv_path, "pip")
+    assert calls == [
+        ([pip_executable, "uninstall", "--yes", "-r"], ["legacy"])
+    ]
+
+
+def test_remove_distribution_files_symlink(fake_venv, tmpdir):
+    """Symlink listed in RECORD is removed, its target is kept."""
+    venv_path, site_packages = fake_venv
+    target_path = os.path.join(str(tmpdir), "target.txt")
+    _write_file(target_path)
+    link_path = os.path.join(site_packages, "linked", "data.txt")
+    _create_distribution(site_packages, "linked", [link_path])
+    os.remove(link_path)
+    try:
+        os.symlink(target_path, link_path)
+    except (OSError, NotImplementedError):
+        pytest.skip("Symlinks are not supported")
+
+    dist = _get_distribution(site_packages, "linked")
+    assert _remove_distribution_files(dist, venv_path) is True
+
+    assert not os.path.lexists(link_path)
+    assert os.path.exists(target_path), "Symlink target must be kept"
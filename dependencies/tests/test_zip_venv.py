@@ -0,0 +1,158 @@
+import io
+import os
+import zlib
+import hashlib
+import zipfile
+
+import pytest
+
+from .. import core
+from ..core import zip_venv, prepare_zip_venv
+from ..utils import ZipFileLongPaths, HashingWriter
+
+
+class NonSeekableStream(io.RawIOBase):
+    """Writable stream without 'seek' and 'tell' support."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data.extend(data)
+        return len(data)
+
+
+def _write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as stream:
+        stream.write(content)
+
+
+@pytest.fixture
+def venv_tree(tmpdir):
+    """Venv and runtime site-packages with few files."""
+    tmpdir = str(tmpdir)
+    venv_path = os.path.join(tmpdir, ".venv")
+    site_packages = os.path.join(
+        venv_path, "lib", "python3.9", "site-packages"
+    )
+    runtime_site_packages = os.path.join(
+        tmpdir, "runtime", "lib", "python3.9", "site-packages"
+    )
+    for root in (site_packages, runtime_site_packages):
+        _write_file(
+            os.path.join(root, "pkg", "__init__.py"), b"import os\n" * 100
+        )
+        _write_file(
+            os.path.join(root, "pkg", "sub", "module.py"), b"x = 1\n" * 1000
+        )
+        _write_file(
+            os.path.join(root, "pkg", "__pycache__", "module.pyc"), b"\0" * 10
+        )
+        _write_file(os.path.join(root, "pkg", "empty.txt"), b"")
+        _write_file(os.path.join(root, "pkg", "image.png"), os.urandom(2048))
+        _write_file(os.path.join(root, "pkg", "big.bin"), b"a" * 4096)
+
+    return venv_path, site_packages, runtime_site_packages
+
+
+def _expected_files(site_packages, runtime_site_packages):
+    expected = {}
+    for src_root, dst_root, skip_pycache in (
+        (site_packages, "dependencies", True),
+        (runtime_site_packages, "runtime", False),
+    ):
+        for root, dirnames, filenames in os.walk(src_root):
+            if skip_pycache and "__pycache__" in dirnames:
+                dirnames.remove("__pycache__")
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                zip_path = "/".join(
+                    [dst_root] + os.path.relpath(path, src_root).split(os.sep)
+                )
+                with open(path, "rb") as stream:
+                    expected[zip_path] = stream.read()
+    return expected
+
+
+def test_zip_venv_roundtrip(venv_tree, tmpdir, monkeypatch):
+    """Zipped files match source tree, '__pycache__' of venv is skipped."""
+    venv_path, site_packages, runtime_site_packages = venv_tree
+    # Write bigger files using 'ZipFile.write' to test both code paths
+    monkeypatch.setattr(core, "_ZIP_MAX_PARALLEL_FILE_SIZE", 1024)
+
+    zip_path = os.path.join(str(tmpdir), "venv.zip")
+    zip_venv(venv_path, runtime_site_packages, zip_path)
+
+    expected = _expected_files(site_packages, runtime_site_packages)
+    with zipfile.ZipFile(zip_path) as zipf:
+        assert zipf.testzip() is None, "Zip file contains corrupted member"
+        assert sorted(zipf.namelist()) == sorted(expected)
+        for name, content in expected.items():
+            assert zipf.read(name) == content, f"Content of {name} differs"
+
+        info = zipf.getinfo("dependencies/pkg/image.png")
+        assert info.compress_type == zipfile.ZIP_STORED
+
+        info = zipf.getinfo("dependencies/pkg/sub/module.py")
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+
+    assert "runtime/pkg/__pycache__/module.pyc" in expected
+    assert "dependencies/pkg/__pycache__/module.pyc" not in expected
+
+
+def test_prepare_zip_venv_checksum(venv_tree, tmpdir, monkeypatch):
+    """Streamed checksum and size match created zip file."""
+    venv_path, _, runtime_site_packages = venv_tree
+    monkeypatch.setattr(
+        core, "create_dependency_package_basename", lambda: "package"
+    )
+
+    output_root = os.path.join(str(tmpdir), "output")
+    os.makedirs(output_root)
+    zip_path, checksum, size = prepare_zip_venv(
+        venv_path, runtime_site_packages, output_root
+    )
+
+    assert zip_path == os.path.join(output_root, "package.zip")
+    with open(zip_path, "rb") as stream:
+        content = stream.read()
+    assert size == os.path.getsize(zip_path) == len(content)
+    assert checksum == hashlib.sha256(content).hexdigest()
+
+    with zipfile.ZipFile(zip_path) as zipf:
+        assert zipf.testzip() is None, "Zip file contains corrupted member"
+
+
+def test_write_compressed_non_seekable():
+    """Precompressed members are readable from non-seekable stream."""
+    members = {
+        "stored.bin": (b"stored data", zipfile.ZIP_STORED),
+        "deflated.txt": (b"deflated data " * 100, zipfile.ZIP_DEFLATED),
+    }
+    stream = NonSeekableStream()
+    writer = HashingWriter(stream)
+    with ZipFileLongPaths(writer, "w") as zipf:
+        for name, (content, compress_type) in members.items():
+            zinfo = zipfile.ZipInfo(name)
+            zinfo.compress_type = compress_type
+            zinfo.file_size = len(content)
+            zinfo.CRC = zlib.crc32(content)
+            data = content
+            if compress_type == zipfile.ZIP_DEFLATED:
+                compressor = zlib.compressobj(1, zlib.DEFLATED, -15)
+                data = compressor.compress(content) + compressor.flush()
+            zinfo.compress_size = len(data)
+            zipf.write_compressed(zinfo, data)
+
+    content = bytes(stream.data)
+    assert writer.size == len(content)
+    assert writer.hexdigest() == hashlib.sha256(content).hexdigest()
+
+    with zipfile.ZipFile(io.BytesIO(content)) as zipf:
+        assert zipf.testzip() is None, "Zip file contains corrupted member"
+        for name, (expected, _) in members.items():
+            assert zipf.read(name) == expected
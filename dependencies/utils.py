@@ -1,12 +1,16 @@
 import os
 import sys
+import glob
 import time
 import re
 import subprocess
 import platform
 import zipfile
+import hashlib
 
 PACKAGE_ROOT = os.path.dirname(os.path.abspath(__file__))
+PLATFORM_NAME = platform.system().lower()
+IS_WINDOWS = PLATFORM_NAME == "windows"
 
 
 def get_venv_executable(venv_root, executable="python"):
@@ -17,7 +21,7 @@ def get_venv_executable(venv_root, executable="python"):
         executable (Optional[str]): Name of executable. Defaults to "python".
     """
 
-    if platform.system().lower() == "windows":
+    if IS_WINDOWS:
         bin_folder = "Scripts"
     else:
         bin_folder = "bin"
@@ -27,8 +31,9 @@ def get_venv_executable(venv_root, executable="python"):
 def get_venv_site_packages(venv_root):
     """Path to site-packages folder in virtual environment.
 
-    Todos:
-        Find more elegant way to get site-packages paths.
+    Only known venv layouts are checked, 'Lib/site-packages' on windows and
+        'lib/python{x}.{y}/site-packages' on linux and macos, so the whole
+        venv does not have to be walked.
 
     Args:
         venv_root (str): Path to venv root.
@@ -37,12 +42,11 @@ def get_venv_site_packages(venv_root):
         list[str]: Normalized paths to site-packages dirs.
     """
 
-    output = []
-    for root, dirnames, _ in os.walk(venv_root):
-        for dirname in dirnames:
-            if dirname == "site-packages":
-                output.append(os.path.join(root, dirname))
-    return output
+    return glob.glob(
+        os.path.join(venv_root, "Lib", "site-packages")
+    ) + glob.glob(
+        os.path.join(venv_root, "lib", "python*", "site-packages")
+    )
 
 
 def run_subprocess(
@@ -103,7 +107,7 @@ class ZipFileLongPaths(zipfile.ZipFile):
     That limit can be exceeded by using an extended-length path that
     starts with the '\\?\' prefix.
     """
-    _is_windows = platform.system().lower() == "windows"
+    _is_windows = IS_WINDOWS
 
     def _extract_member(self, member, tpath, pwd):
         if self._is_windows:
@@ -116,3 +120,98 @@ class ZipFileLongPaths(zipfile.ZipFile):
         return super(ZipFileLongPaths, self)._extract_member(
             member, tpath, pwd
         )
+
+    def write_compressed(self, zinfo, data):
+        """Write member with data that are already compressed.
+
+        Allows to compress data outside of the zip file, e.g. in multiple
+        threads, and only write them in order here.
+
+        Args:
+            zinfo (zipfile.ZipInfo): Member info with filled 'CRC',
+                'file_size', 'compress_size' and 'compress_type'.
+            data (bytes): Data compressed using 'compress_type' (raw
+                deflate stream for 'zipfile.ZIP_DEFLATED').
+        """
+
+        with self._lock:
+            if self._writing:
+                raise ValueError(
+                    "Can't write to the ZIP file while there is"
+                    " another write handle open on it."
+                )
+
+            zip64 = (
+                zinfo.file_size > zipfile.ZIP64_LIMIT
+                or zinfo.compress_size > zipfile.ZIP64_LIMIT
+            )
+            if zip64 and not self._allowZip64:
+                raise zipfile.LargeZipFile(
+                    "Filesize would require ZIP64 extensions"
+                )
+
+            # Sizes and CRC are known, data descriptor is not needed
+            zinfo.flag_bits = 0x00
+            if not zinfo.external_attr:
+                zinfo.external_attr = 0o600 << 16
+
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+
+            self._writecheck(zinfo)
+            self._didModify = True
+
+            self.fp.write(zinfo.FileHeader(zip64))
+            self.fp.write(data)
+            self.start_dir = self.fp.tell()
+
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+
+
+class HashingWriter:
+    """Writable stream wrapper calculating hash of written data.
+
+    Wrapper does not support 'seek' and 'tell', so 'zipfile.ZipFile' writes
+    file sequentially and does not modify already written data. Hash and
+    size of created file are available when the file is closed, without
+    reading it again.
+
+    Args:
+        stream (BinaryIO): Stream where data are written.
+        algorithm (Optional[str]): Hash algorithm. Defaults to "sha256".
+    """
+
+    def __init__(self, stream, algorithm="sha256"):
+        self._stream = stream
+        self._checksum = hashlib.new(algorithm)
+        self._size = 0
+
+    def write(self, data):
+        self._checksum.update(data)
+        written = self._stream.write(data)
+        self._size += written
+        return written
+
+    def flush(self):
+        self._stream.flush()
+
+    def hexdigest(self):
+        """Hash of all written data.
+
+        Returns:
+            str: Hex digest of written data.
+        """
+
+        return self._checksum.hexdigest()
+
+    @property
+    def size(self):
+        """Count of written bytes.
+
+        Returns:
+            int: Size of written data.
+        """
+
+        return self._size